@@ -0,0 +1,158 @@
+"""Local stand-in for the Supabase REST API (PostgREST) used by app.py.
+
+Keeps the micropy table in memory and implements just the requests the app
+makes: multi-row inserts, deletes by id or test->>id (optionally below a row
+id), selects with projections, id filters, ordering by id or test->id and
+limits, and HEAD counts. Latency and errors can be injected to see how the app
+behaves when Supabase is slow or failing.
+
+    python bench/fake_postgrest.py --port 54321 --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+
+then start the app with SUPABASE_URL=http://127.0.0.1:54321.
+"""
+from fastapi import FastAPI, Request, Response
+from typing import List, Optional
+from datetime import datetime
+import argparse
+import asyncio
+import json
+import os
+import random
+import uvicorn
+
+# Injected behaviour, set from the command line or the environment
+LATENCY_MS = float(os.environ.get("FAKE_LATENCY_MS", 0))
+JITTER_MS = float(os.environ.get("FAKE_JITTER_MS", 0))
+ERROR_RATE = float(os.environ.get("FAKE_ERROR_RATE", 0))
+
+app = FastAPI(title="Fake PostgREST")
+
+# The micropy table: rows in row ID order
+rows: List[dict] = []
+next_row_id = 1
+stats = {"requests": 0, "errors_injected": 0}
+
+def parse_in_list(value: str) -> set:
+    """'in.(1,2,3)' -> {1, 2, 3}"""
+    return {int(part) for part in value[len("in.("):-1].split(",") if part}
+
+def item_id(row: dict) -> Optional[int]:
+    test = row.get("test") or {}
+    return test.get("id")
+
+def apply_filters(selected: List[dict], params) -> List[dict]:
+    if "id" in params:
+        op, value = params["id"].split(".", 1)
+        if op == "gt":
+            selected = [row for row in selected if row["id"] > int(value)]
+        elif op == "lt":
+            selected = [row for row in selected if row["id"] < int(value)]
+        elif op == "eq":
+            selected = [row for row in selected if row["id"] == int(value)]
+        elif op == "in":
+            wanted = parse_in_list(params["id"])
+            selected = [row for row in selected if row["id"] in wanted]
+    if "test->>id" in params:
+        op, value = params["test->>id"].split(".", 1)
+        if op == "eq":
+            selected = [row for row in selected if str(item_id(row)) == value]
+        elif op == "in":
+            wanted = parse_in_list(params["test->>id"])
+            selected = [row for row in selected if item_id(row) in wanted]
+    if params.get("test->id") == "not.is.null":
+        selected = [row for row in selected if item_id(row) is not None]
+    if "and" in params:
+        # Only the range form the app sends: (id.gt.A,id.lte.B)
+        low, high = params["and"].strip("()").split(",")
+        after, upto = int(low.split(".")[2]), int(high.split(".")[2])
+        selected = [row for row in selected if after < row["id"] <= upto]
+    return selected
+
+def project(row: dict, columns: List[str]) -> dict:
+    """Apply a select list such as id,name:test->name,test->>value"""
+    result = {}
+    for column in columns:
+        alias, _, path = column.rpartition(":")
+        if "->" in path:
+            as_text = "->>" in path
+            source, key = path.replace("->>", "->").split("->", 1)
+            value = (row.get(source) or {}).get(key)
+            if as_text and value is not None and not isinstance(value, str):
+                value = json.dumps(value)
+            result[alias or key] = value
+        else:
+            result[alias or path] = row.get(path)
+    return result
+
+async def inject():
+    """Sleep for the configured latency; return an error response now and then"""
+    stats["requests"] += 1
+    delay = LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        stats["errors_injected"] += 1
+        return Response(status_code=503, content=b'{"message":"injected error"}', media_type="application/json")
+    return None
+
+@app.post("/rest/v1/{table}")
+async def insert(table: str, request: Request):
+    global next_row_id
+    error = await inject()
+    if error is not None:
+        return error
+    body = json.loads(await request.body())
+    inserted = []
+    for row in body if isinstance(body, list) else [body]:
+        row = {"id": next_row_id, "created_at": datetime.now().isoformat(), **row}
+        next_row_id += 1
+        rows.append(row)
+        inserted.append(row)
+    if "return=representation" in request.headers.get("prefer", ""):
+        return Response(status_code=201, content=json.dumps(inserted), media_type="application/json")
+    return Response(status_code=201)
+
+@app.delete("/rest/v1/{table}")
+async def delete(table: str, request: Request):
+    error = await inject()
+    if error is not None:
+        return error
+    doomed = {row["id"] for row in apply_filters(rows, request.query_params)}
+    rows[:] = [row for row in rows if row["id"] not in doomed]
+    return Response(status_code=204)
+
+@app.api_route("/rest/v1/{table}", methods=["GET", "HEAD"])
+async def select(table: str, request: Request):
+    error = await inject()
+    if error is not None:
+        return error
+    params = request.query_params
+    selected = apply_filters(rows, params)
+    total = len(selected)
+    if params.get("order") == "id.desc":
+        selected = list(reversed(selected))
+    elif params.get("order", "").startswith("test->id.desc"):
+        selected = sorted(selected, key=item_id, reverse=True)
+    if "limit" in params:
+        selected = selected[:int(params["limit"])]
+    columns = params.get("select", "*")
+    if columns != "*":
+        selected = [project(row, columns.split(",")) for row in selected]
+    headers = {"Content-Range": f"0-{max(0, len(selected) - 1)}/{total}"}
+    if request.method == "HEAD":
+        return Response(status_code=200, headers=headers)
+    return Response(content=json.dumps(selected), media_type="application/json", headers=headers)
+
+@app.get("/_stats")
+async def get_stats():
+    return {**stats, "rows": len(rows)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=JITTER_MS)
+    parser.add_argument("--error-rate", type=float, default=ERROR_RATE)
+    args = parser.parse_args()
+    LATENCY_MS, JITTER_MS, ERROR_RATE = args.latency_ms, args.jitter_ms, args.error_rate
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,256 @@
+"""Load test for app.py against a local fake PostgREST (bench/fake_postgrest.py).
+
+Starts the fake Supabase and the app as subprocesses, drives a weighted mix of
+requests at a fixed concurrency and prints throughput and p50/p95/p99 latency
+per operation as JSON, so runs on different commits can be compared.
+
+    python bench/run.py --duration 30 --concurrency 32 --latency-ms 20 --output bench.json
+    python bench/run.py --mix post_data=5,get_item=5 --env STORAGE_BACKEND=sqlite
+
+Extra app settings are passed with --env KEY=VALUE (repeatable).
+"""
+from typing import List, Dict, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import httpx
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default request mix: operation -> weight
+DEFAULT_MIX = {
+    "post_data": 25,
+    "bulk": 5,
+    "get_item": 30,
+    "test1": 15,
+    "health": 5,
+    "list_data": 10,
+    "supabase_rows": 10
+}
+
+class Workload:
+    """Builds the requests of the mix and remembers created IDs for reads"""
+
+    def __init__(self, bulk_size: int):
+        self.bulk_size = bulk_size
+        self.ids: List[int] = []
+        self.counter = 0
+
+    def reading(self) -> dict:
+        self.counter += 1
+        return {
+            "name": f"sensor-{self.counter % 20}",
+            "value": round(random.uniform(0, 100), 2),
+            "description": "benchmark reading"
+        }
+
+    async def post_data(self, client: httpx.AsyncClient) -> httpx.Response:
+        response = await client.post("/data", json=self.reading())
+        if response.status_code == 200:
+            self.ids.append(response.json()["data"]["id"])
+        return response
+
+    async def bulk(self, client: httpx.AsyncClient) -> httpx.Response:
+        response = await client.post("/data/bulk", json=[self.reading() for _ in range(self.bulk_size)])
+        if response.status_code == 200:
+            self.ids.extend(response.json()["created_ids"])
+        return response
+
+    async def get_item(self, client: httpx.AsyncClient) -> httpx.Response:
+        item_id = random.choice(self.ids) if self.ids else 1
+        return await client.get(f"/data/{item_id}")
+
+    async def test1(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(f"/test1/{random.randint(0, 1000)}")
+
+    async def health(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/health")
+
+    async def list_data(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/data")
+
+    async def supabase_rows(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/supabase-data/rows", params={"limit": 100})
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Workload, name.strip()):
+            raise SystemExit(f"Unknown operation in mix: {name}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: List[float], statuses: Dict[str, int], elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status == "error" or status.startswith("5"))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+        "statuses": dict(sorted(statuses.items()))
+    }
+
+async def drive(base_url: str, mix: Dict[str, int], args) -> dict:
+    workload = Workload(args.bulk_size)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results: Dict[str, Tuple[List[float], Dict[str, int]]] = {name: ([], {}) for name in names}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        for _ in range(args.prefill):
+            await workload.post_data(client)
+        loop = asyncio.get_running_loop()
+        stop_at = loop.time() + args.duration
+        remaining = [args.requests]
+
+        async def worker():
+            while loop.time() < stop_at and (not args.requests or remaining[0] > 0):
+                remaining[0] -= 1
+                name = random.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await getattr(workload, name)(client)
+                    status = str(response.status_code)
+                except httpx.HTTPError:
+                    status = "error"
+                latencies, statuses = results[name]
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = loop.time()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = loop.time() - started
+
+    all_latencies = [latency for latencies, _ in results.values() for latency in latencies]
+    all_statuses: Dict[str, int] = {}
+    for _, statuses in results.values():
+        for status, count in statuses.items():
+            all_statuses[status] = all_statuses.get(status, 0) + count
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": summarize(all_latencies, all_statuses, elapsed),
+        "operations": {name: summarize(*results[name], elapsed) for name in names if results[name][0]}
+    }
+
+def start_process(command: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(command, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Process for {url} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise SystemExit(f"Timed out waiting for {url}")
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run (default 10)")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many requests (0 = run for --duration)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", help="operation=weight,... (default: %s)" % ",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument("--bulk-size", type=int, default=20)
+    parser.add_argument("--prefill", type=int, default=100, help="items created before measuring")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--latency-ms", type=float, default=10, help="injected Supabase latency")
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of Supabase calls answered with 503")
+    parser.add_argument("--app-port", type=int, default=18000)
+    parser.add_argument("--fake-port", type=int, default=18001)
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE setting for the app")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    mix = parse_mix(args.mix)
+
+    fake_env = {
+        **os.environ,
+        "FAKE_LATENCY_MS": str(args.latency_ms),
+        "FAKE_JITTER_MS": str(args.jitter_ms),
+        "FAKE_ERROR_RATE": str(args.error_rate)
+    }
+    app_env = {
+        **os.environ,
+        "SUPABASE_URL": f"http://127.0.0.1:{args.fake_port}",
+        "SUPABASE_KEY": "bench"
+    }
+    app_env.update(setting.split("=", 1) for setting in args.env)
+    fake = start_process([sys.executable, "bench/fake_postgrest.py", "--port", str(args.fake_port)], fake_env)
+    server = None
+    try:
+        wait_until_up(f"http://127.0.0.1:{args.fake_port}/_stats", fake)
+        server = start_process(
+            [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.app_port), "--log-level", "warning"],
+            app_env
+        )
+        base_url = f"http://127.0.0.1:{args.app_port}"
+        wait_until_up(f"{base_url}/health/live", server)
+        report = asyncio.run(drive(base_url, mix, args))
+        fake_stats = httpx.get(f"http://127.0.0.1:{args.fake_port}/_stats").json()
+    finally:
+        for process in (server, fake):
+            if process is not None:
+                process.terminate()
+                try:
+                    process.wait(10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "duration": args.duration,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "bulk_size": args.bulk_size,
+            "prefill": args.prefill,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "env": args.env,
+            "seed": args.seed
+        },
+        **report,
+        "supabase": fake_stats
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()